@@ -36,6 +36,18 @@ if [ -z "$CONTAINER_ID" ]; then
 fi
 echo "Container started with ID: $CONTAINER_ID"
 
+cleanup() {
+	echo "Stopping and removing the Docker container..."
+	sudo docker stop $CONTAINER_ID
+	sudo docker rm $CONTAINER_ID
+	echo "Container stopped and removed."
+
+	echo "Removing the Docker image..."
+	sudo docker rmi $DOCKER_ID
+	echo "Image removed."
+}
+trap cleanup EXIT
+
 echo "Executing command in the Docker container..."
 sudo docker exec $CONTAINER_ID /bin/bash -c "bash /home/run.sh"
 if [ $? -ne 0 ]; then
@@ -45,14 +57,21 @@ fi
 echo "Command executed successfully."
 
 echo "Copying the result from the Docker container..."
-sudo docker cp $CONTAINER_ID:/home/result/ /data/$TASKID/$USERID/
-echo "Result copied to /data/$TASKID/$USERID/"
+sudo docker cp $CONTAINER_ID:/home/result - > /data/$TASKID/$USERID/result.tar
+if [ $? -ne 0 ]; then
+	echo "Error copying the result from the container."
+	exit 1
+fi
+echo "Result copied to /data/$TASKID/$USERID/result.tar"
 
-echo "Stopping and removing the Docker container..."
-sudo docker stop $CONTAINER_ID
-sudo docker rm $CONTAINER_ID
-echo "Container stopped and removed."
+cleanup
+trap - EXIT
 
-echo "Removing the Docker image..."
-sudo docker rmi $DOCKER_ID
-echo "Image removed."
+echo "Indexing the result into /data/$TASKID/$USERID/result.jsonl..."
+python "$(dirname "$0")/../eval/pack.py" --verify /data/$TASKID/$USERID/result.tar /data/$TASKID/$USERID/result.jsonl
+if [ $? -ne 0 ]; then
+	echo "Error indexing the result."
+	exit 1
+fi
+rm /data/$TASKID/$USERID/result.tar
+echo "Result indexed."
@@ -9,6 +9,20 @@ CONTAINER_ID="$1"
 TASKID="$2"
 USERID="$3"
 
+cleanup() {
+	DOCKER_ID=$(sudo docker inspect --format "{{.Image}}" $CONTAINER_ID)
+
+	echo "Stopping and removing the Docker container..."
+	sudo docker stop $CONTAINER_ID
+	sudo docker rm $CONTAINER_ID
+	echo "Container stopped and removed."
+
+	echo "Removing the Docker image..."
+	sudo docker rmi $DOCKER_ID
+	echo "Image removed."
+}
+trap cleanup EXIT
+
 echo "Executing command in the Docker container..."
 sudo docker exec $CONTAINER_ID /bin/bash -c "bash /home/run.sh"
 if [ $? -ne 0 ]; then
@@ -18,15 +32,21 @@ fi
 echo "Command executed successfully."
 
 echo "Copying the result from the Docker container..."
-sudo docker cp $CONTAINER_ID:/home/result/ /data/$TASKID/$USERID/
-echo "Result copied to /data/$TASKID/$USERID/"
-
-echo "Stopping and removing the Docker container..."
-sudo docker stop $CONTAINER_ID
-sudo docker rm $CONTAINER_ID
-echo "Container stopped and removed."
-
-echo "Removing the Docker image..."
-DOCKER_ID=$(sudo docker ps -a -q --filter "id=$CONTAINER_ID" --format "{{.Image}}")
-sudo docker rmi $DOCKER_ID
-echo "Image removed."
+sudo docker cp $CONTAINER_ID:/home/result - > /data/$TASKID/$USERID/result.tar
+if [ $? -ne 0 ]; then
+	echo "Error copying the result from the container."
+	exit 1
+fi
+echo "Result copied to /data/$TASKID/$USERID/result.tar"
+
+cleanup
+trap - EXIT
+
+echo "Indexing the result into /data/$TASKID/$USERID/result.jsonl..."
+python "$(dirname "$0")/../eval/pack.py" --verify /data/$TASKID/$USERID/result.tar /data/$TASKID/$USERID/result.jsonl
+if [ $? -ne 0 ]; then
+	echo "Error indexing the result."
+	exit 1
+fi
+rm /data/$TASKID/$USERID/result.tar
+echo "Result indexed."
@@ -2,7 +2,7 @@ import argparse
 import json
 import csv
 import os
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 run_time = 1
 
@@ -52,6 +52,19 @@ def parse_user_json(json_file_path: str) -> List[Tuple[List[Dict], str]]:
     with open(json_file_path, "r") as file:
         data = json.load(file)
 
+    return parse_user_data(data)
+
+
+def parse_user_data(data) -> List[Tuple[List[Dict], str]]:
+    """
+    Extracts the object data and image file names from the loaded content of a user JSON file.
+
+    Args:
+    data (Dict or List[Dict]): A single result dictionary or a list of result dictionaries.
+
+    Returns:
+    List[Tuple[List[Dict], str]]: A list of tuples, each containing object data and the associated image file name.
+    """
     parsed_data = []
 
     if type(data).__name__ == "dict":
@@ -78,7 +91,7 @@ def parse_user_folder(folder_path: str) -> List[Tuple[List[Dict], str]]:
     List[Tuple[List[Dict], str]]: A list of tuples, each containing object data and the associated image file name.
     """
     user_data = []
-    for file in os.listdir(folder_path):
+    for file in sorted(os.listdir(folder_path)):
         if file.endswith(".json"):
             file_path = os.path.join(folder_path, file)
             user_data.extend(parse_user_json(file_path))
@@ -86,22 +99,94 @@ def parse_user_folder(folder_path: str) -> List[Tuple[List[Dict], str]]:
     return user_data
 
 
-def process_user_input(input_path: str) -> List[Tuple[List[Dict], str]]:
+def parse_user_archive(archive_path: str) -> Iterator[Tuple[List[Dict], str]]:
     """
-    Processes the user's input, which can be either a single JSON file or a folder containing multiple JSON files.
+    Parses a packed JSONL archive produced by pack.py, yielding its records one line at a time.
 
     Args:
-    input_path (str): The path to the JSON file or folder containing JSON files.
+    archive_path (str): The file path of the JSONL archive.
+
+    Yields:
+    Tuple[List[Dict], str]: The object data and the associated image file name of each record.
+    """
+    with open(archive_path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                item = json.loads(line)
+                yield item["objects"], item["image_name"]
+
+
+def load_archive_index(archive_path: str) -> Dict[str, List[int]]:
+    """
+    Loads the offset index written next to a packed JSONL archive.
+
+    Args:
+    archive_path (str): The file path of the JSONL archive.
 
     Returns:
-    List[Tuple[List[Dict], str]]: A list of tuples, each containing object data and the associated image file name.
+    Dict[str, List[int]]: A mapping from image name to the [offset, length] of its record in the archive.
+    """
+    with open(archive_path + ".idx", "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def read_archive_record(
+    archive_path: str, image_name: str, index: Optional[Dict[str, List[int]]] = None
+) -> List[Dict]:
+    """
+    Reads the object data of a single image from a packed JSONL archive without scanning the whole file.
+
+    Args:
+    archive_path (str): The file path of the JSONL archive.
+    image_name (str): The image file name to look up.
+    index (Optional[Dict[str, List[int]]]): The archive index; loaded from disk when not given.
+
+    Returns:
+    List[Dict]: The object data for the image, or an empty list if the image is not in the archive.
+    """
+    if index is None:
+        index = load_archive_index(archive_path)
+    if image_name not in index:
+        return []
+
+    offset, length = index[image_name]
+    with open(archive_path, "rb") as file:
+        file.seek(offset)
+        line = file.read(length)
+
+    try:
+        item = json.loads(line.decode("utf-8"))
+    except ValueError:
+        item = None
+    if not isinstance(item, dict) or item.get("image_name") != image_name:
+        raise ValueError(
+            f"The index of {archive_path} does not match the archive at {image_name}."
+        )
+
+    return item["objects"]
+
+
+def process_user_input(input_path: str) -> Iterable[Tuple[List[Dict], str]]:
+    """
+    Processes the user's input, which can be a single JSON file, a packed JSONL archive or a folder containing multiple JSON files.
+
+    Args:
+    input_path (str): The path to the JSON file, JSONL archive or folder containing JSON files.
+
+    Returns:
+    Iterable[Tuple[List[Dict], str]]: Tuples, each containing object data and the associated image file name.
+                                      Archives are streamed, so the result can only be iterated once.
     """
     if os.path.isfile(input_path) and input_path.endswith(".json"):
         return parse_user_json(input_path)
+    elif os.path.isfile(input_path) and input_path.endswith(".jsonl"):
+        return parse_user_archive(input_path)
     elif os.path.isdir(input_path):
         return parse_user_folder(input_path)
     else:
-        raise ValueError("The input path is neither a JSON file nor a directory.")
+        raise ValueError(
+            "The input path is neither a JSON file, a JSONL archive nor a directory."
+        )
 
 
 def calculate_iou(box1: Dict, box2: Dict) -> float:
@@ -398,12 +483,24 @@ def get_gt_data_label(gt_data):
     return gt_label_set
 
 
-def main(gt_folder_path, user_folder_path, csv_path):
+def main(gt_folder_path, user_folder_path, csv_path, image_name=None):
     gt_data = parse_gt_folder(gt_folder_path)
 
+    if image_name:
+        gt_data = {image_name: gt_data.get(image_name, [])}
+
     gt_label_set = get_gt_data_label(gt_data)
 
-    predict_data = process_user_input(user_folder_path)
+    if image_name and user_folder_path.endswith(".jsonl"):
+        predict_data = [(read_archive_record(user_folder_path, image_name), image_name)]
+    elif image_name:
+        predict_data = [
+            (objects, name)
+            for objects, name in process_user_input(user_folder_path)
+            if name == image_name
+        ]
+    else:
+        predict_data = process_user_input(user_folder_path)
 
     matched_gt, matched_preds, unmatched_preds = match_predictions(
         gt_data, predict_data
@@ -442,10 +539,18 @@ if __name__ == "__main__":
         "gt_folder_path", type=str, help="Path to the ground truth folder"
     )
     parser.add_argument(
-        "user_folder_path", type=str, help="Path to the user result folder"
+        "user_folder_path",
+        type=str,
+        help="Path to the user result folder or packed JSONL archive",
     )
     parser.add_argument("csv_path", type=str, help="Path to save the output CSV file")
+    parser.add_argument(
+        "--image_name",
+        type=str,
+        default=None,
+        help="Only re-evaluate this image; read via the index for JSONL archives",
+    )
 
     args = parser.parse_args()
 
-    main(args.gt_folder_path, args.user_folder_path, args.csv_path)
+    main(args.gt_folder_path, args.user_folder_path, args.csv_path, args.image_name)
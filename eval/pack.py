@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import posixpath
+import sys
+import tarfile
+from typing import Dict, Iterator, List, Tuple
+
+from eval import parse_user_data, parse_user_json
+
+
+def iter_user_records(source_path: str) -> Iterator[Tuple[List[Dict], str]]:
+    """
+    Iterates over the user results in a result folder or in a tar of that folder.
+
+    Only JSON files directly inside the folder are read; for a tar these are the direct children
+    of its top-level directory, matching how parse_user_folder reads a folder.
+
+    Args:
+    source_path (str): The path to the folder containing JSON files, or to a tar archive of it.
+
+    Yields:
+    Tuple[List[Dict], str]: The object data and the associated image file name of each result.
+    """
+    if os.path.isdir(source_path):
+        for file in sorted(os.listdir(source_path)):
+            if file.endswith(".json"):
+                yield from parse_user_json(os.path.join(source_path, file))
+    elif tarfile.is_tarfile(source_path):
+        with tarfile.open(source_path, "r:*") as tar:
+            for member in sorted(tar.getmembers(), key=lambda m: m.name):
+                parts = posixpath.normpath(member.name).split("/")
+                if member.isfile() and len(parts) == 2 and parts[1].endswith(".json"):
+                    data = json.load(tar.extractfile(member))
+                    yield from parse_user_data(data)
+    else:
+        raise ValueError("The source path is neither a directory nor a tar archive.")
+
+
+def pack_user_folder(
+    source_path: str, archive_path: str, verify: bool = False
+) -> Dict[str, List[int]]:
+    """
+    Packs user results into a single JSONL archive and writes an offset index next to it.
+
+    Both files are written to temporary paths and only moved into place once every result
+    has been packed, so a failed run never leaves a truncated archive or a stale index behind.
+    A repeated image name is kept in the archive and the index points at its last record,
+    so the last record wins just as when scoring the folder directly.
+
+    Args:
+    source_path (str): The path to the folder containing JSON files, or to a tar archive of it.
+    archive_path (str): The file path of the JSONL archive to create.
+    verify (bool): Whether to check the written archive against its index before moving it into place.
+
+    Returns:
+    Dict[str, List[int]]: The index, mapping each image name to the [offset, length] of its record in the archive.
+    """
+    index_path = archive_path + ".idx"
+    tmp_archive_path = archive_path + ".tmp"
+    tmp_index_path = index_path + ".tmp"
+
+    index = {}
+    try:
+        with open(tmp_archive_path, "wb") as archive:
+            for objects, image_name in iter_user_records(source_path):
+                if image_name in index:
+                    print(
+                        f"Warning: duplicate image_name {image_name}, "
+                        "the last record wins",
+                        file=sys.stderr,
+                    )
+                record = {"image_name": image_name, "objects": objects}
+                line = json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+                index[image_name] = [archive.tell(), len(line)]
+                archive.write(line)
+
+        if verify:
+            verify_archive(tmp_archive_path, index)
+
+        with open(tmp_index_path, "w", encoding="utf-8") as file:
+            json.dump(index, file, ensure_ascii=False)
+    except BaseException:
+        for path in (tmp_archive_path, tmp_index_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    os.replace(tmp_archive_path, archive_path)
+    os.replace(tmp_index_path, index_path)
+
+    return index
+
+
+def verify_archive(archive_path: str, index: Dict[str, List[int]]) -> None:
+    """
+    Checks in one sequential pass that every indexed record sits at its recorded offset and length.
+
+    Args:
+    archive_path (str): The file path of the JSONL archive.
+    index (Dict[str, List[int]]): The archive index to check.
+    """
+    seen = 0
+    offset = 0
+    with open(archive_path, "rb") as file:
+        for line in file:
+            image_name = json.loads(line.decode("utf-8"))["image_name"]
+            expected = index.get(image_name)
+            if expected == [offset, len(line)]:
+                seen += 1
+            elif expected is None or expected[0] <= offset:
+                raise ValueError(
+                    f"Archive record does not match the index: {image_name}"
+                )
+            offset += len(line)
+
+    if seen != len(index):
+        raise ValueError(
+            f"Archive index has {len(index)} records but {seen} were found."
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Pack a user result folder into an indexed JSONL archive."
+    )
+    parser.add_argument(
+        "user_folder_path",
+        type=str,
+        help="Path to the user result folder or a tar archive of it",
+    )
+    parser.add_argument(
+        "archive_path", type=str, help="Path to save the output JSONL archive"
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check the archive against its index before moving it into place",
+    )
+
+    args = parser.parse_args()
+
+    index = pack_user_folder(args.user_folder_path, args.archive_path, args.verify)
+    print(f"Packed {len(index)} records into {args.archive_path}")